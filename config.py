@@ -23,6 +23,8 @@ VOSK_VOCABULARY = [
     "turn left",
     "turn right",
     "stop",
+    "where am i",
+    "this is",
     "help",
     "return home",
     "exit",
@@ -32,4 +34,17 @@ VOSK_VOCABULARY = [
     "bathroom",
     "home",
     "outside",
-]
\ No newline at end of file
+]
+
+# Print every motor command (and MockGPIO pin write) to the console. Off by
+# default: console I/O on the stop path would add to the measured stop latency.
+VERBOSE_MOTOR_LOGGING = False
+
+# Latency tracing and counters (see telemetry/metrics.py).
+# Disabled by default: recording calls then cost a single flag check.
+METRICS_ENABLED = False
+# Each process writes a JSON snapshot of its metrics into this folder.
+METRICS_DIR = "metrics_output"
+METRICS_EXPORT_INTERVAL = 5.0  # seconds
+# Set to a port number to also serve the metrics on http://127.0.0.1:<port>/
+METRICS_HTTP_PORT = None
@@ -0,0 +1,4 @@
+# conftest.py
+
+# Lets a bare `pytest` from the project root import the top-level packages
+# (navigation, sensors, ...) the same way `python -m pytest` does.
@@ -1,18 +1,26 @@
 # control/motors.py
 
 import time
+from threading import RLock
+
+try:
+    from config import VERBOSE_MOTOR_LOGGING
+except ImportError:
+    VERBOSE_MOTOR_LOGGING = False
 
 # --- Mock RPi.GPIO module for testing on Windows ---
 # This class simulates the RPi.GPIO library so we can run the code
 # on a non-Raspberry Pi machine without an ImportError.
-# It prints the GPIO commands instead of executing them.
+# It prints the GPIO commands instead of executing them (pin writes and duty
+# cycle changes only when verbose, as they happen on every motor command).
 class MockGPIO:
     BCM = 11
     OUT = 1
     HIGH = 1
     LOW = 0
 
-    def __init__(self):
+    def __init__(self, verbose=False):
+        self.verbose = verbose
         self.pins = {}
         self.pwm_channels = {}
     
@@ -24,24 +32,27 @@ class MockGPIO:
         print(f"GPIO: Setting up pin {pin} as {'OUTPUT' if mode == self.OUT else 'INPUT'}")
 
     def output(self, pin, value):
-        print(f"GPIO: Setting pin {pin} to {value}")
+        if self.verbose:
+            print(f"GPIO: Setting pin {pin} to {value}")
 
     def PWM(self, pin, frequency):
         print(f"GPIO: Initializing PWM on pin {pin} with frequency {frequency}Hz")
-        return self.MockPWM(pin)
+        return self.MockPWM(pin, self.verbose)
 
     def cleanup(self):
         print("GPIO: Cleaning up pins.")
 
     class MockPWM:
-        def __init__(self, pin):
+        def __init__(self, pin, verbose=False):
             self.pin = pin
+            self.verbose = verbose
         
         def start(self, duty_cycle):
             print(f"GPIO: Starting PWM on pin {self.pin} with duty cycle {duty_cycle}%")
 
         def ChangeDutyCycle(self, duty_cycle):
-            print(f"GPIO: Changing PWM duty cycle on pin {self.pin} to {duty_cycle}%")
+            if self.verbose:
+                print(f"GPIO: Changing PWM duty cycle on pin {self.pin} to {duty_cycle}%")
 
         def stop(self):
             print(f"GPIO: Stopping PWM on pin {self.pin}")
@@ -51,14 +62,26 @@ class MockGPIO:
 class MotorController:
     """
     Controls the two DC motors using an L298N motor driver.
+
+    Every pin/PWM sequence runs under a lock: the ultrasonic thread calls
+    stop() while the main thread may be half-way through a move, and
+    interleaved writes could leave one side of the H-bridge driven.
+
+    With simulate=True, MockGPIO is used even on a Raspberry Pi. Per-command
+    prints only appear with verbose=True (default: VERBOSE_MOTOR_LOGGING in
+    config.py), so console I/O stays off the stop path.
     """
-    def __init__(self):
+    def __init__(self, simulate=False, verbose=None):
+        self.lock = RLock()
+        self.verbose = VERBOSE_MOTOR_LOGGING if verbose is None else verbose
         try:
+            if simulate:
+                raise ImportError("simulation requested")
             import RPi.GPIO as GPIO
             self.IS_RASPBERRY_PI = True
             print("MotorController: Running on Raspberry Pi with real RPi.GPIO.")
         except (ImportError, RuntimeError):
-            GPIO = MockGPIO()
+            GPIO = MockGPIO(verbose=self.verbose)
             self.IS_RASPBERRY_PI = False
             print("MotorController: Running in simulation mode with MockGPIO.")
         
@@ -94,54 +117,67 @@ class MotorController:
         print("MotorController: Initialization complete.")
 
     def set_speed(self, speed):
-        duty_cycle = max(0, min(100, speed))
-        self.right_pwm.ChangeDutyCycle(duty_cycle)
-        self.left_pwm.ChangeDutyCycle(duty_cycle)
-        print(f"MotorController: Setting motor speed to {duty_cycle}%.")
+        with self.lock:
+            duty_cycle = max(0, min(100, speed))
+            self.right_pwm.ChangeDutyCycle(duty_cycle)
+            self.left_pwm.ChangeDutyCycle(duty_cycle)
+            if self.verbose:
+                print(f"MotorController: Setting motor speed to {duty_cycle}%.")
 
     def move_forward(self, speed=50):
-        self.GPIO.output(self.RIGHT_IN1, self.GPIO.HIGH)
-        self.GPIO.output(self.RIGHT_IN2, self.GPIO.LOW)
-        self.GPIO.output(self.LEFT_IN3, self.GPIO.HIGH)
-        self.GPIO.output(self.LEFT_IN4, self.GPIO.LOW)
-        self.set_speed(speed)
-        print("MotorController: Moving forward.")
+        with self.lock:
+            self.GPIO.output(self.RIGHT_IN1, self.GPIO.HIGH)
+            self.GPIO.output(self.RIGHT_IN2, self.GPIO.LOW)
+            self.GPIO.output(self.LEFT_IN3, self.GPIO.HIGH)
+            self.GPIO.output(self.LEFT_IN4, self.GPIO.LOW)
+            self.set_speed(speed)
+            if self.verbose:
+                print("MotorController: Moving forward.")
 
     def move_backward(self, speed=50):
-        self.GPIO.output(self.RIGHT_IN1, self.GPIO.LOW)
-        self.GPIO.output(self.RIGHT_IN2, self.GPIO.HIGH)
-        self.GPIO.output(self.LEFT_IN3, self.GPIO.LOW)
-        self.GPIO.output(self.LEFT_IN4, self.GPIO.HIGH)
-        self.set_speed(speed)
-        print("MotorController: Moving backward.")
+        with self.lock:
+            self.GPIO.output(self.RIGHT_IN1, self.GPIO.LOW)
+            self.GPIO.output(self.RIGHT_IN2, self.GPIO.HIGH)
+            self.GPIO.output(self.LEFT_IN3, self.GPIO.LOW)
+            self.GPIO.output(self.LEFT_IN4, self.GPIO.HIGH)
+            self.set_speed(speed)
+            if self.verbose:
+                print("MotorController: Moving backward.")
 
     def stop(self):
-        self.GPIO.output(self.RIGHT_IN1, self.GPIO.LOW)
-        self.GPIO.output(self.RIGHT_IN2, self.GPIO.LOW)
-        self.GPIO.output(self.LEFT_IN3, self.GPIO.LOW)
-        self.GPIO.output(self.LEFT_IN4, self.GPIO.LOW)
-        self.set_speed(0)
-        print("MotorController: Stopping.")
+        with self.lock:
+            self.GPIO.output(self.RIGHT_IN1, self.GPIO.LOW)
+            self.GPIO.output(self.RIGHT_IN2, self.GPIO.LOW)
+            self.GPIO.output(self.LEFT_IN3, self.GPIO.LOW)
+            self.GPIO.output(self.LEFT_IN4, self.GPIO.LOW)
+            self.set_speed(0)
+            if self.verbose:
+                print("MotorController: Stopping.")
 
     def turn_left(self, speed=50):
-        self.GPIO.output(self.RIGHT_IN1, self.GPIO.HIGH)
-        self.GPIO.output(self.RIGHT_IN2, self.GPIO.LOW)
-        self.GPIO.output(self.LEFT_IN3, self.GPIO.LOW)
-        self.GPIO.output(self.LEFT_IN4, self.GPIO.HIGH)
-        self.set_speed(speed)
-        print("MotorController: Turning left.")
+        with self.lock:
+            self.GPIO.output(self.RIGHT_IN1, self.GPIO.HIGH)
+            self.GPIO.output(self.RIGHT_IN2, self.GPIO.LOW)
+            self.GPIO.output(self.LEFT_IN3, self.GPIO.LOW)
+            self.GPIO.output(self.LEFT_IN4, self.GPIO.HIGH)
+            self.set_speed(speed)
+            if self.verbose:
+                print("MotorController: Turning left.")
 
     def turn_right(self, speed=50):
-        self.GPIO.output(self.RIGHT_IN1, self.GPIO.LOW)
-        self.GPIO.output(self.RIGHT_IN2, self.GPIO.HIGH)
-        self.GPIO.output(self.LEFT_IN3, self.GPIO.HIGH)
-        self.GPIO.output(self.LEFT_IN4, self.GPIO.LOW)
-        self.set_speed(speed)
-        print("MotorController: Turning right.")
+        with self.lock:
+            self.GPIO.output(self.RIGHT_IN1, self.GPIO.LOW)
+            self.GPIO.output(self.RIGHT_IN2, self.GPIO.HIGH)
+            self.GPIO.output(self.LEFT_IN3, self.GPIO.HIGH)
+            self.GPIO.output(self.LEFT_IN4, self.GPIO.LOW)
+            self.set_speed(speed)
+            if self.verbose:
+                print("MotorController: Turning right.")
 
     def cleanup(self):
-        self.stop()
-        self.right_pwm.stop()
-        self.left_pwm.stop()
-        self.GPIO.cleanup()
-        print("MotorController: Cleanup complete.")
+        with self.lock:
+            self.stop()
+            self.right_pwm.stop()
+            self.left_pwm.stop()
+            self.GPIO.cleanup()
+            print("MotorController: Cleanup complete.")
@@ -16,6 +16,13 @@ try:
     from voice.wakeword import WakeWordDetector
     from control.motors import MotorController
     from vision.detector import ObjectDetectorProcess
+    from sensors.ultrasonic import UltrasonicSensor
+    from sensors.imu import IMUSensor
+    from sensors.lidar_sim import SimulatedLidar
+    from memory.learn import load_rooms, save_room
+    from navigation.place_recognition import PlaceIndex
+    from telemetry import metrics
+    from config import METRICS_HTTP_PORT
 except ImportError as e:
     print(f"CRITICAL ERROR importing a module: {e}. Please ensure all files exist.")
     sys.exit(1)
@@ -24,55 +31,132 @@ except ImportError as e:
 class Robot:
     def __init__(self):
         print("🤖 Initializing NOVA-GUIDE...")
+        metrics.configure("main")
         # ✅ GENIUS FIX: Create a single, shared queue for all audio requests.
         self.audio_queue = Queue()
 
         # --- Process and Thread Initialization ---
-        self.audio_process = AudioProcess(self.audio_queue)
-        self.voice_command = VoiceRecognizer()
-        self.motor_controller = MotorController()
+        # The _create_* methods are overridden by replay/harness.py to swap in
+        # recorded inputs and simulated outputs.
+        self.audio_process = self._create_audio_process()
+        self.voice_command = self._create_voice_recognizer()
+        self.motor_controller = self._create_motor_controller()
+        # Fast-path proximity stop: the ultrasonic thread calls stop() itself,
+        # without waiting for the ~10 FPS vision loop or this main loop.
+        self.ultrasonic_sensor = self._create_ultrasonic_sensor()
+        self.imu_sensor = self._create_imu_sensor()
+        self.lidar = self._create_lidar()
+        # "Where am I" matches live scans against the rooms saved with a scan.
+        self.place_index = PlaceIndex.from_rooms(load_rooms())
+        # There is no odometry yet, so learned rooms are saved at the origin.
+        self.position = [0.0, 0.0]
         self.wake_word_event = Event()
         self.wake_word_detector = None # Will be created in the run loop
+        self.shutdown_requested = Event()
         self.vision_obstacle_detected = multiprocessing.Value('b', False)
+        # time.monotonic() of the frame that raised the flag, set by the vision process.
+        self.vision_obstacle_timestamp = multiprocessing.Value('d', 0.0)
         self.vision_stop_event = multiprocessing.Event()
-        self.object_detector_instance = ObjectDetectorProcess()
+        self.object_detector_instance = self._create_object_detector()
         self.vision_process = multiprocessing.Process(
             target=self.object_detector_instance.run,
-            args=(self.vision_obstacle_detected, self.vision_stop_event),
+            args=(self.vision_obstacle_detected, self.vision_stop_event,
+                  self.vision_obstacle_timestamp),
             daemon=True
         )
 
         # --- State Machine & Task Memory ---
         self.is_stopped_by_vision = False
+        self.obstacle_seen_by_vision = False  # whether vision raised the last obstacle check
         self.current_task = None
         self.last_time_obstacle_was_seen = 0.0
         self.clear_duration_threshold = 2.0
+        self.poll_interval = 0.1  # seconds between obstacle checks while waiting for the wake word
+
+    def _create_audio_process(self):
+        return AudioProcess(self.audio_queue)
+
+    def _create_voice_recognizer(self):
+        return VoiceRecognizer()
+
+    def _create_motor_controller(self):
+        return MotorController()
+
+    def _create_ultrasonic_sensor(self):
+        return UltrasonicSensor(on_proximity=self.motor_controller.stop)
+
+    def _create_imu_sensor(self):
+        return IMUSensor()
+
+    def _create_lidar(self):
+        return SimulatedLidar()
+
+    def _create_object_detector(self):
+        return ObjectDetectorProcess()
+
+    def _create_wake_word_detector(self):
+        return WakeWordDetector(self.wake_word_event)
+
+    def _clock(self):
+        """The time (in seconds) used to decide when the path counts as clear."""
+        return time.time()
 
     def say(self, text):
         """A simple helper to put text on the audio queue."""
         print(f"Queueing for TTS: '{text}'")
-        self.audio_queue.put(text)
+        self.audio_queue.put((text, metrics.now()))
+        if metrics.is_enabled():
+            try:
+                metrics.gauge("tts.backlog", self.audio_queue.qsize())
+            except NotImplementedError:
+                pass
 
     def process_command(self, command):
         """Processes a voice command and sets the robot's current task."""
         command = command.lower().strip() if command else ""
-        is_path_blocked = self.is_stopped_by_vision
-
-        if "kitchen" in command:
+        # The ultrasonic flag stays set while something is within range, even
+        # after its one-off stop; check it too so a command cannot drive into it.
+        is_path_blocked = (self.is_stopped_by_vision
+                           or self.ultrasonic_sensor.obstacle_detected.is_set())
+
+        if command.startswith("this is"):
+            # Checked first: "this is kitchen" must not be taken as "go to kitchen".
+            room_name = command[len("this is"):].strip()
+            if room_name:
+                self.learn_room(room_name)
+                self.say(f"Okay, I will remember the {room_name}.")
+            else:
+                self.say("Please tell me the name of this room.")
+        elif "kitchen" in command:
             if not is_path_blocked:
                 self.current_task = {'action': 'move_forward', 'speed': 50}
                 self.say("Okay, going to the kitchen.")
                 self.motor_controller.move_forward(speed=50)
             else:
                 self.say("I cannot go to the kitchen, my path is blocked.")
+        elif "where am i" in command:
+            match = self.place_index.locate(self.lidar.read_scan())
+            if match:
+                self.say(f"You are in the {match['room']}.")
+            else:
+                self.say("I don't recognise this place.")
         elif "stop" in command:
             self.current_task = None
             self.motor_controller.stop()
             self.say("Stopping all movement and cancelling task.")
 
+    def learn_room(self, room_name):
+        """Saves the current place under room_name so "where am I" can recognise it."""
+        scan = self.lidar.read_scan()
+        save_room(room_name, list(self.position), lidar_scan=scan)
+        self.place_index.add(room_name, scan)
+
     def resume_current_task(self):
         """Resumes a task from memory if one exists."""
         if not self.current_task: return
+        if self.ultrasonic_sensor.obstacle_detected.is_set():
+            print("🛑 [DECISION] Ultrasonic obstacle still in range. Not resuming.")
+            return
         self.say("Resuming my task.")
         action = self.current_task.get('action')
         if action == 'move_forward':
@@ -80,16 +164,21 @@ class Robot:
 
     def check_obstacle_state(self):
         """The robust state checker with task resumption logic."""
-        is_obstacle_seen_now = self.vision_obstacle_detected.value
+        is_seen_by_vision = self.vision_obstacle_detected.value
+        self.obstacle_seen_by_vision = is_seen_by_vision
+        is_obstacle_seen_now = (is_seen_by_vision
+                                or self.ultrasonic_sensor.obstacle_detected.is_set())
 
         if is_obstacle_seen_now:
-            self.last_time_obstacle_was_seen = time.time()
+            self.last_time_obstacle_was_seen = self._clock()
             if not self.is_stopped_by_vision:
                 self.is_stopped_by_vision = True
                 self.motor_controller.stop()
+                if is_seen_by_vision:
+                    metrics.observe_since("vision.frame_to_stop", self.vision_obstacle_timestamp.value)
                 self.say("Obstacle detected. Pausing task.")
         elif self.is_stopped_by_vision:
-            time_since_last_sighting = time.time() - self.last_time_obstacle_was_seen
+            time_since_last_sighting = self._clock() - self.last_time_obstacle_was_seen
             if time_since_last_sighting >= self.clear_duration_threshold:
                 self.is_stopped_by_vision = False
                 # ✅ Restored the missing print statement for clarity
@@ -101,6 +190,11 @@ class Robot:
 
     def cleanup(self):
         print("\n--- Cleaning up resources... ---")
+        # Join the sensor threads before GPIO.cleanup() releases their pins.
+        for sensor in (self.ultrasonic_sensor, self.imu_sensor):
+            sensor.stop()
+            if sensor.is_alive():
+                sensor.join(timeout=1)
         self.motor_controller.cleanup()
         if self.wake_word_detector and self.wake_word_detector.is_alive():
             self.wake_word_detector.stop()
@@ -110,28 +204,42 @@ class Robot:
         # ✅ GENIUS FIX: Signal the audio process to shut down.
         self.audio_queue.put(None)
         if self.audio_process.is_alive(): self.audio_process.join(timeout=2)
-        cv2.destroyAllWindows()
+        if self.object_detector_instance.show_window:
+            cv2.destroyAllWindows()
+        metrics.export()
         print("--- Cleanup Complete. ---")
 
     def run(self):
         print("--- Starting NOVA-GUIDE: The Legendary Build ---")
         self.vision_process.start()
         self.audio_process.start()
+        self.ultrasonic_sensor.start()
+        self.imu_sensor.start()
         self.say("System initiated. Say my name to give a command.")
+        if METRICS_HTTP_PORT:
+            metrics.serve_http(METRICS_HTTP_PORT)
 
-        self.wake_word_detector = WakeWordDetector(self.wake_word_event)
+        self.wake_word_detector = self._create_wake_word_detector()
         self.wake_word_detector.start()
 
         try:
-            while True:
+            while not self.shutdown_requested.is_set():
                 self.check_obstacle_state()
-                if self.wake_word_event.wait(timeout=0.1):
+                metrics.maybe_export()
+                if self.wake_word_event.wait(timeout=self.poll_interval):
                     self.wake_word_event.clear()
                     self.wake_word_detector.join()
+                    wake_at = self.wake_word_detector.detected_at
+                    metrics.observe_since("wake.detect_to_dispatch", wake_at)
                     self.say("Yes?")
+                    listen_at = metrics.now()
                     command = self.voice_command.listen_for_command()
-                    if command: self.process_command(command)
-                    self.wake_word_detector = WakeWordDetector(self.wake_word_event)
+                    metrics.observe_since("voice.listen", listen_at)
+                    if command:
+                        metrics.observe_since("wake.to_command", wake_at)
+                        self.process_command(command)
+                        metrics.observe_since("wake.to_action", wake_at)
+                    self.wake_word_detector = self._create_wake_word_detector()
                     self.wake_word_detector.start()
         except KeyboardInterrupt:
             print("\n--- User initiated shutdown. ---")
@@ -2,16 +2,24 @@
 
 import json
 import os
+from datetime import datetime, timezone
+
+from navigation.place_recognition import compute_descriptor
 
 CONFIG_FILE_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'commands.json')
 
-def save_room(name, coords):
+def save_room(name, coords, lidar_scan=None):
     """
     Saves a new room name and its coordinates to the commands.json file.
+
+    When a LiDAR scan is given, the room is stored as a record (like the
+    known_locations in config.json) carrying the scan and its place-recognition
+    signature, so navigation/place_recognition can recognise it later.
     
     Args:
         name (str): The name of the room (e.g., "hall").
         coords (list): A list of two floats representing the [x, y] coordinates.
+        lidar_scan (list, optional): A 360-degree scan taken in the room, in metres.
     """
     try:
         with open(CONFIG_FILE_PATH, "r") as f:
@@ -20,7 +28,15 @@ def save_room(name, coords):
         # Handle cases where the file doesn't exist or is empty
         rooms = {}
         
-    rooms[name] = coords
+    if lidar_scan is None:
+        rooms[name] = coords
+    else:
+        rooms[name] = {
+            "coordinates": coords,
+            "lidar_signature": [round(float(v), 5) for v in compute_descriptor(lidar_scan)],
+            "lidar_scan": [round(float(r), 3) for r in lidar_scan],
+            "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%MZ"),
+        }
     
     with open(CONFIG_FILE_PATH, "w") as f:
         json.dump(rooms, f, indent=2)
@@ -31,7 +47,8 @@ def load_rooms():
     Loads all saved room names and their coordinates from the commands.json file.
     
     Returns:
-        dict: A dictionary of room names mapped to their coordinates.
+        dict: A dictionary of room names mapped to their coordinates, or to a
+            room record (with "coordinates") for rooms saved with a LiDAR scan.
     """
     try:
         with open(CONFIG_FILE_PATH, "r") as f:
@@ -0,0 +1,192 @@
+# navigation/geocoding.py
+
+"""
+Caching and offline lookup for outdoor navigation.
+
+GeoCache keeps recent results in an in-memory LRU in front of a persistent
+on-disk shelf, both with a time-to-live. Gazetteer is an offline index of
+known places loaded from a local JSON file, searchable by normalised name
+and, through a spatial grid, by "nearest <category>".
+"""
+
+import json
+import math
+import os
+import re
+import shelve
+import time
+from collections import OrderedDict
+
+GAZETTEER_FILE_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'gazetteer.json')
+GEOCACHE_FILE_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'geocache')
+ROUTE_CACHE_FILE_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'geocache_routes')
+
+GRID_CELL_DEGREES = 0.01    # ~1.1 km cells
+EARTH_RADIUS_M = 6371000.0
+METRES_PER_DEGREE = EARTH_RADIUS_M * math.pi / 180
+
+_RELATIVE_WORDS = {'nearest', 'closest', 'nearby'}
+_FILLER_WORDS = {'the', 'a', 'an', 'to'} | _RELATIVE_WORDS
+
+
+def normalize_place_name(place):
+    """Lowercases a place name and strips punctuation and filler words."""
+    words = re.sub(r"[^a-z0-9 ]", " ", place.lower()).split()
+    return " ".join(w for w in words if w not in _FILLER_WORDS)
+
+
+def is_relative_place(place):
+    """True if the place depends on where the robot is, e.g. "nearest pharmacy"."""
+    return any(w in _RELATIVE_WORDS for w in re.sub(r"[^a-z0-9 ]", " ", place.lower()).split())
+
+
+def haversine_m(a, b):
+    """Returns the great-circle distance in metres between two (lat, lon) points."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(h))
+
+
+class GeoCache:
+    """
+    A two-level cache: an in-memory LRU backed by a persistent shelf on disk.
+
+    Entries expire ttl seconds after they were stored. Expiry uses wall-clock
+    time so that it still holds across restarts.
+    """
+    def __init__(self, path=GEOCACHE_FILE_PATH, ttl=30 * 24 * 3600, maxsize=256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._memory = OrderedDict()
+        try:
+            self._disk = shelve.open(path) if path else None
+        except OSError as e:
+            print(f"⚠️ [GeoCache] Could not open on-disk cache '{path}': {e}")
+            self._disk = None
+
+    def get(self, key):
+        """Returns the cached value for key, or None if missing or expired."""
+        entry = self._memory.get(key)
+        if entry is None and self._disk is not None:
+            entry = self._disk.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at < time.time():
+            self._memory.pop(key, None)
+            if self._disk is not None and key in self._disk:
+                del self._disk[key]
+            return None
+
+        self._remember(key, entry)
+        return value
+
+    def put(self, key, value):
+        entry = (value, time.time() + self.ttl)
+        self._remember(key, entry)
+        if self._disk is not None:
+            self._disk[key] = entry
+            self._disk.sync()
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+
+class Gazetteer:
+    """
+    An offline index of named places, loaded from a local JSON file.
+
+    The file is a list of {"name", "category", "lat", "lon"} records.
+    Places are indexed by normalised name and by normalised category, and
+    each category is bucketed into a lat/lon grid so "nearest pharmacy"
+    only looks at the cells around the robot.
+    """
+    def __init__(self, path=GAZETTEER_FILE_PATH, cell_degrees=GRID_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self._by_name = {}
+        self._grid = {}
+        try:
+            with open(path, "r") as f:
+                places = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            print("⚠️ [Gazetteer] No offline gazetteer found. Falling back to online geocoding.")
+            places = []
+        for place in places:
+            self.add(place["name"], place.get("category", ""), place["lat"], place["lon"])
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def _cell(self, lat, lon):
+        return (math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees))
+
+    def add(self, name, category, lat, lon):
+        coords = (lat, lon)
+        self._by_name[normalize_place_name(name)] = coords
+        cells = self._grid.setdefault(normalize_place_name(category), {})
+        cells.setdefault(self._cell(lat, lon), []).append(coords)
+
+    def lookup(self, place):
+        """Returns the (lat, lon) of a place by name, or None if unknown."""
+        return self._by_name.get(normalize_place_name(place))
+
+    def is_category(self, place):
+        return normalize_place_name(place) in self._grid
+
+    def nearest(self, category, coords, max_rings=20):
+        """
+        Finds the closest place of a category to coords.
+
+        The grid is searched in square rings of cells around coords, and
+        stops once the next ring cannot hold anything closer than the best
+        place found so far.
+
+        Returns:
+            tuple: (latitude, longitude), or None if nothing is within range.
+        """
+        cells = self._grid.get(normalize_place_name(category))
+        if not cells:
+            return None
+
+        cx, cy = self._cell(*coords)
+        best, best_distance = None, float('inf')
+        for ring in range(max_rings + 1):
+            if ring > 0 and self._ring_min_distance(coords, ring) > best_distance:
+                break
+            for dx in range(-ring, ring + 1):
+                for dy in range(-ring, ring + 1):
+                    if max(abs(dx), abs(dy)) != ring:
+                        continue
+                    for candidate in cells.get((cx + dx, cy + dy), ()):
+                        distance = haversine_m(coords, candidate)
+                        if distance < best_distance:
+                            best, best_distance = candidate, distance
+        return best
+
+    def _ring_min_distance(self, coords, ring):
+        """
+        Returns a lower bound, in metres, on the distance from coords to any
+        point in the given ring: the distance to the edge of the square made
+        of the rings inside it.
+        """
+        lat, lon = coords
+        cx, cy = self._cell(lat, lon)
+        lat_margin = min(lat - (cx - ring + 1) * self.cell_degrees,
+                         (cx + ring) * self.cell_degrees - lat)
+        lon_margin = min(lon - (cy - ring + 1) * self.cell_degrees,
+                         (cy + ring) * self.cell_degrees - lon)
+        # Longitude degrees shrink with cos(latitude); use the widest latitude
+        # the ring reaches so this stays a lower bound.
+        max_abs_lat = min(90.0, abs(lat) + ring * self.cell_degrees)
+        lon_scale = math.cos(math.radians(max_abs_lat))
+        return METRES_PER_DEGREE * min(lat_margin, lon_margin * lon_scale)
@@ -1,7 +1,15 @@
 # navigation/outdoor.py
 
+import atexit
+import math
+
 from geopy.geocoders import Nominatim
 
+from .geocoding import (GeoCache, Gazetteer, ROUTE_CACHE_FILE_PATH, haversine_m,
+                        is_relative_place, normalize_place_name)
+
+ROUTE_CACHE_PRECISION = 4   # decimal places (~11 m) used to key cached routes
+
 # We'll use a mock Nominatim for now to avoid external API calls during simulation.
 class MockNominatim:
     def __init__(self, *args, **kwargs):
@@ -16,9 +24,45 @@ class MockNominatim:
             return type('MockLocation', (object,), {'latitude': 9.68, 'longitude': 76.5})()
         return None
 
+# Created once and shared by every call, instead of once per request.
+_geolocator = MockNominatim(user_agent="nova-guide")
+_gazetteer = Gazetteer()
+# The caches open shelve files, so they are only created on first use
+# (importing this module must not lock them) and closed at exit.
+_geocode_cache = None
+_route_cache = None
+
+def _get_geocode_cache():
+    global _geocode_cache
+    if _geocode_cache is None:
+        _geocode_cache = GeoCache(ttl=30 * 24 * 3600)
+    return _geocode_cache
+
+def _get_route_cache():
+    global _route_cache
+    if _route_cache is None:
+        _route_cache = GeoCache(path=ROUTE_CACHE_FILE_PATH, ttl=24 * 3600)
+    return _route_cache
+
+def close_caches():
+    """Closes the on-disk geocoding and route caches, if they were opened."""
+    global _geocode_cache, _route_cache
+    for cache in (_geocode_cache, _route_cache):
+        if cache is not None:
+            cache.close()
+    _geocode_cache = _route_cache = None
+
+atexit.register(close_caches)
+
 def get_coords(place):
     """
     Gets the GPS coordinates for a given place name.
+
+    The offline gazetteer is tried first ("nearest <category>" queries are
+    answered from it relative to the current position), then the geocoding
+    cache, and only then the geocoder itself. Queries relative to the current
+    position ("nearest ...") that the gazetteer cannot answer are never
+    cached, since their answer changes as the robot moves.
     
     Args:
         place (str): The name of the place (e.g., "nearest pharmacy").
@@ -26,10 +70,24 @@ def get_coords(place):
     Returns:
         tuple: A tuple of (latitude, longitude), or None if not found.
     """
-    geolocator = MockNominatim(user_agent="nova-guide")
-    location = geolocator.geocode(place)
+    coords = _gazetteer.lookup(place)
+    if coords is None and _gazetteer.is_category(place):
+        coords = _gazetteer.nearest(place, get_current_coords())
+    if coords is not None:
+        return coords
+
+    cache = None if is_relative_place(place) else _get_geocode_cache()
+    key = normalize_place_name(place)
+    coords = cache.get(key) if cache is not None else None
+    if coords is not None:
+        return coords
+
+    location = _geolocator.geocode(place)
     if location:
-        return (location.latitude, location.longitude)
+        coords = (location.latitude, location.longitude)
+        if cache is not None:
+            cache.put(key, coords)
+        return coords
     return None
 
 def get_current_coords():
@@ -45,11 +103,34 @@ def get_current_coords():
 def show_route(start_coords, end_coords):
     """
     Simulates getting and providing a route from a start to end point.
+
+    Routes are cached by start/end rounded to ROUTE_CACHE_PRECISION decimal
+    places, so repeating a request from (almost) the same spot is instant.
     
     Args:
         start_coords (tuple): The starting GPS coordinates.
         end_coords (tuple): The destination GPS coordinates.
+
+    Returns:
+        dict: The route, with its 'distance_m' and initial 'bearing_deg'.
     """
+    key = repr(tuple(round(c, ROUTE_CACHE_PRECISION) for c in (*start_coords, *end_coords)))
+    route = _get_route_cache().get(key)
+    if route is not None:
+        return route
+
     print(f"🗺️ [OutdoorNav] Planning route from {start_coords} to {end_coords}.")
     # In a real-world scenario, this would call a routing API.
-    # For now, we just print the action.
+    # For now, the route is a straight line to the destination.
+    lat1, lon1, lat2, lon2 = map(math.radians, (*start_coords, *end_coords))
+    bearing = math.degrees(math.atan2(
+        math.sin(lon2 - lon1) * math.cos(lat2),
+        math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(lon2 - lon1)))
+    route = {
+        'start': tuple(start_coords),
+        'end': tuple(end_coords),
+        'distance_m': haversine_m(start_coords, end_coords),
+        'bearing_deg': bearing % 360,
+    }
+    _get_route_cache().put(key, route)
+    return route
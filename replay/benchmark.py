@@ -0,0 +1,115 @@
+# replay/benchmark.py
+
+"""
+Runs replay scenarios as a benchmark suite and guards against latency regressions.
+
+Usage (from the project root):
+
+    python -m replay.benchmark scenarios/*.json --runs 3 --output report.json
+    python -m replay.benchmark scenarios/*.json --baseline report_v3.json
+    python -m replay.benchmark scenarios/*.json --deterministic
+
+The report holds every run's results (see replay/harness.py) plus p50/p95
+summaries of command, wake-to-command and stop latency. With --baseline,
+the exit status is non-zero if any p95 is worse than the baseline's by more
+than --max-regression (relative) plus --slack-ms (absolute), if a latency
+has fewer samples than in the baseline (e.g. the vision -> stop chain no
+longer fires), or if any run took a decision the scenario did not expect.
+Use --deterministic to check decisions, and realtime runs (the default) to
+compare latencies.
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from replay.harness import ReplayRobot, load_scenario
+
+LATENCY_KEYS = ('command_latencies_ms', 'wake_to_command_latencies_ms', 'stop_latencies_ms')
+
+
+def summarize(latencies_ms):
+    """Returns count, p50, p95 and max of a list of latencies in milliseconds."""
+    if not latencies_ms:
+        return {'count': 0, 'p50_ms': None, 'p95_ms': None, 'max_ms': None}
+    values = np.asarray(latencies_ms, dtype=float)
+    return {
+        'count': len(values),
+        'p50_ms': round(float(np.percentile(values, 50)), 2),
+        'p95_ms': round(float(np.percentile(values, 95)), 2),
+        'max_ms': round(float(values.max()), 2),
+    }
+
+
+def run_suite(scenario_paths, runs=1, realtime=True):
+    results = []
+    for path in scenario_paths:
+        for i in range(runs):
+            print(f"⏯️ [Replay] Running '{path}' ({i + 1}/{runs})...")
+            results.append(ReplayRobot(load_scenario(path), realtime=realtime).run())
+
+    summary = {}
+    for key in LATENCY_KEYS:
+        summary[key] = summarize([ms for result in results for ms in result[key]])
+    return {'summary': summary, 'runs': results}
+
+
+def find_regressions(report, baseline, max_regression, slack_ms):
+    """Compares latencies against a baseline report; returns a list of failures."""
+    failures = []
+    for key in LATENCY_KEYS:
+        stats = report['summary'][key]
+        reference_stats = baseline.get('summary', {}).get(key, {})
+        current = stats['p95_ms']
+        reference = reference_stats.get('p95_ms')
+        if stats['count'] < reference_stats.get('count', 0):
+            failures.append(f"{key} has fewer samples: {stats['count']} "
+                            f"(baseline {reference_stats['count']})")
+        if reference is None:
+            continue
+        if current is None:
+            failures.append(f"{key} has no samples (baseline p95 {reference:.1f} ms)")
+            continue
+        limit = reference * (1 + max_regression) + slack_ms
+        if current > limit:
+            failures.append(f"{key} p95 regressed: {current:.1f} ms > {limit:.1f} ms "
+                            f"(baseline {reference:.1f} ms)")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded scenarios through the Robot.")
+    parser.add_argument("scenarios", nargs="+", help="Scenario JSON files.")
+    parser.add_argument("--runs", type=int, default=1, help="Runs per scenario.")
+    parser.add_argument("--output", help="Write the report to this JSON file.")
+    parser.add_argument("--baseline", help="A previous report to compare p95 latencies against.")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed relative p95 increase over the baseline (default 0.2).")
+    parser.add_argument("--slack-ms", type=float, default=5.0,
+                        help="Allowed absolute p95 increase on top of that (default 5 ms).")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="Step the video in lockstep with the Robot loop (see replay/harness.py) "
+                             "instead of replaying in real time.")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.scenarios, runs=args.runs, realtime=not args.deterministic)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failures = [f"{run['scenario']}: {m}" for run in report['runs'] for m in run['mismatches']]
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            failures += find_regressions(report, json.load(f), args.max_regression, args.slack_ms)
+
+    for key, stats in report['summary'].items():
+        print(f"📊 [Replay] {key}: {stats}")
+    for failure in failures:
+        print(f"❌ [Replay] {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,467 @@
+# replay/harness.py
+
+"""
+Replay of recorded audio and video through the Robot.
+
+A scenario is a JSON file (paths are relative to it):
+
+    {
+        "name": "kitchen_then_person",
+        "video": "hallway_person.mp4",
+        "interactions": [
+            {"at": 2.0, "wake": "nova.wav", "command": "go_to_kitchen.wav",
+             "expect_command": "go to kitchen"}
+        ],
+        "expect_actions": ["move_forward", "stop"],
+        "seed": 0,
+        "tail": 3.0,
+        "timeout": 120.0
+    }
+
+Each interaction sits on the scenario timeline: "at" is in seconds of
+video time (or use "at_frame" for a frame index), and interactions are
+played in order.
+
+ReplayRobot runs the normal Robot loop, but:
+- the wake word comes from each interaction's WAV, released at its "at",
+- the command is recognised by VoiceRecognizer from the "command" WAV,
+- ObjectDetectorProcess reads the video instead of a webcam, without a window,
+- motors, TTS and the ultrasonic/IMU sensors are simulated and recorded,
+  and the simulated sensors and LiDAR draw their noise from random.Random
+  generators seeded from the scenario's "seed".
+
+WAV files must be 16-bit mono at 16 kHz. Command clips should be trimmed
+to end where the speaker stops: the last sample fed to the recognizer
+(the end of the clip, unless the command is recognised earlier) is taken
+as the end of speech. If Porcupine cannot be created (no access key, or the platform does
+not match the .ppn model), the end of each wake clip is taken as the
+detection so the rest of the chain still runs.
+
+The run ends once every interaction is done, the video has finished and
+"tail" more seconds have passed (or after "timeout" seconds). Each run
+returns a report of command latencies (end of command audio -> command
+handled), wake-to-command latencies (wake word detected -> command handled),
+stop latencies (obstacle frame captured -> MotorController.stop()), the
+decisions taken and any mismatch with the scenario's expectations.
+
+There are two modes:
+- realtime=True replays at the recording's own pace, like a live run:
+  interactions are released on the wall clock and the video skips frames
+  that fall due while YOLO is busy. Latencies are realistic, but which
+  frames get analysed (and so the decisions) can vary with machine load.
+  Compare releases on latency distributions over several runs.
+- realtime=False is deterministic. The video is stepped in lockstep with
+  the Robot loop: every frame is analysed in order, the loop checks the
+  obstacle state once per frame, and the video is held at each
+  interaction's frame until its command has been handled. The "path clear"
+  timer runs on video time. The same scenario and seed then lead to the
+  same decisions on any machine. Wall-clock time is only used for the
+  latency numbers, which here also include the lockstep hand-offs.
+"""
+
+import json
+import os
+import random
+import time
+import wave
+from multiprocessing import Value
+from threading import Thread, Event
+
+import cv2
+import numpy as np
+
+from main import Robot
+from control.motors import MotorController
+from vision.detector import ObjectDetectorProcess
+from voice.recognizer import VoiceRecognizer
+from sensors.ultrasonic import UltrasonicSensor, SimulatedUltrasonicDriver
+from sensors.imu import IMUSensor, SimulatedIMUDriver
+from sensors.lidar_sim import SimulatedLidar
+
+WAKE_FRAME_LENGTH = 512     # samples per wake-word frame when Porcupine is unavailable
+LOCKSTEP_POLL_INTERVAL = 0.005  # seconds; how often the Robot loop checks for a finished frame
+
+
+def load_scenario(path):
+    """Loads a scenario file and resolves its media paths relative to it."""
+    with open(path, "r") as f:
+        scenario = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    scenario.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    if scenario.get("video"):
+        scenario["video"] = os.path.join(base_dir, scenario["video"])
+    for interaction in scenario.get("interactions", []):
+        for key in ("wake", "command"):
+            if interaction.get(key):
+                interaction[key] = os.path.join(base_dir, interaction[key])
+    return scenario
+
+
+def _video_fps(path):
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+    return fps
+
+
+def _create_porcupine():
+    try:
+        import pvporcupine
+        from config import PICOVOICE_ACCESS_KEY, NOVA_WAKE_WORD_MODEL_PATH, PICOVOICE_SENSITIVITY
+        return pvporcupine.create(
+            access_key=PICOVOICE_ACCESS_KEY,
+            keyword_paths=[NOVA_WAKE_WORD_MODEL_PATH],
+            sensitivities=[PICOVOICE_SENSITIVITY]
+        )
+    except Exception as e:
+        print(f"⏯️ [Replay] Porcupine unavailable ({e}); using the end of each wake clip.")
+        return None
+
+
+class WavWakeWordDetector(Thread):
+    """
+    A stand-in for WakeWordDetector that listens to a WAV file instead of the mic.
+
+    The clip starts playing once is_due() returns True.
+    """
+    def __init__(self, wake_word_detected_event, wav_path, is_due=None, realtime=True):
+        super().__init__(daemon=True)
+        self.wake_word_detected_event = wake_word_detected_event
+        self.wav_path = wav_path
+        self.is_due = is_due
+        self.realtime = realtime
+        self.detected_at = None
+        self.missed = False
+        self._stop_event = Event()
+
+    def run(self):
+        while self.is_due is not None and not self.is_due():
+            if self._stop_event.wait(0.001):
+                return
+        porcupine = _create_porcupine()
+        frame_length = porcupine.frame_length if porcupine else WAKE_FRAME_LENGTH
+        try:
+            with wave.open(self.wav_path, "rb") as wav:
+                started_at = time.monotonic()
+                fed = 0
+                while not self._stop_event.is_set():
+                    data = wav.readframes(frame_length)
+                    if len(data) < frame_length * 2:
+                        break
+                    fed += frame_length
+                    if self.realtime:
+                        self._stop_event.wait(max(0.0, started_at + fed / wav.getframerate() - time.monotonic()))
+                    if porcupine and porcupine.process(np.frombuffer(data, dtype=np.int16)) >= 0:
+                        self.detected_at = time.monotonic()
+                        break
+        finally:
+            if porcupine:
+                porcupine.delete()
+
+        if self._stop_event.is_set():
+            return
+        if self.detected_at is None:
+            self.detected_at = time.monotonic()
+            self.missed = porcupine is not None
+        self.wake_word_detected_event.set()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class _IdleWakeWordDetector(Thread):
+    """Used once the scenario has no interactions left: never fires."""
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.detected_at = None
+        self._stop_event = Event()
+
+    def run(self):
+        self._stop_event.wait()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class _NoVideoDetector:
+    """Used when a scenario has no video: the vision process exits at once."""
+    show_window = False
+
+    def run(self, shared_obstacle_flag, stop_event, shared_obstacle_timestamp=None):
+        shared_obstacle_flag.value = False
+
+
+class RecordingMotorController(MotorController):
+    """A MotorController on MockGPIO (even on a Pi) that records every action."""
+    def __init__(self):
+        self.actions = []
+        self.recording = True
+        super().__init__(simulate=True)
+        self.actions.clear()
+
+    def _record(self, action):
+        if self.recording:
+            self.actions.append((action, time.monotonic()))
+
+    def move_forward(self, speed=50):
+        super().move_forward(speed)
+        self._record('move_forward')
+
+    def move_backward(self, speed=50):
+        super().move_backward(speed)
+        self._record('move_backward')
+
+    def stop(self):
+        super().stop()
+        self._record('stop')
+
+    def turn_left(self, speed=50):
+        super().turn_left(speed)
+        self._record('turn_left')
+
+    def turn_right(self, speed=50):
+        super().turn_right(speed)
+        self._record('turn_right')
+
+
+class RecordingAudioSink(Thread):
+    """Replaces AudioProcess: drains the audio queue and records what would be spoken."""
+    def __init__(self, audio_queue):
+        super().__init__(daemon=True)
+        self.audio_queue = audio_queue
+        self.spoken = []
+
+    def run(self):
+        while True:
+            message = self.audio_queue.get()
+            if message is None:
+                break
+            text = message[0] if isinstance(message, tuple) else message
+            self.spoken.append((text, time.monotonic()))
+
+
+class _WavCommandSource:
+    """Stands in for VoiceRecognizer in the Robot loop, feeding each interaction's command WAV."""
+    def __init__(self, robot, recognizer):
+        self.robot = robot
+        self.recognizer = recognizer
+
+    def listen_for_command(self):
+        return self.robot._listen_to_current_interaction(self.recognizer)
+
+
+class ReplayRobot(Robot):
+    """
+    Runs the Robot against a recorded scenario. See the module docstring.
+    """
+    def __init__(self, scenario, realtime=True):
+        self.scenario = scenario
+        self.realtime = realtime
+        self.seed = scenario.get("seed", 0)
+        self.video_fps = _video_fps(scenario["video"]) if scenario.get("video") else None
+        self.lockstep = not realtime and self.video_fps is not None
+        # Lockstep counters shared with the vision process (see ObjectDetectorProcess).
+        self.frame_limit = Value('i', 0)
+        self.frames_done = Value('i', 0)
+        self._video_ended_at = None
+        self._pending_interactions = list(scenario.get("interactions", []))
+        self._current_interaction = None
+        self._speech_ended_at = None
+        self._wake_detected_at = None
+        self._idle_since = None
+        self._started_at = None
+        self.commands = []
+        self.command_latencies = []
+        self.wake_to_command_latencies = []
+        self.stop_latencies = []
+        self.mismatches = []
+        super().__init__()
+        if not realtime:
+            self.poll_interval = LOCKSTEP_POLL_INTERVAL
+
+    # --- Simulated and recorded components ---
+
+    def _create_audio_process(self):
+        return RecordingAudioSink(self.audio_queue)
+
+    def _create_voice_recognizer(self):
+        return _WavCommandSource(self, VoiceRecognizer())
+
+    def _create_motor_controller(self):
+        return RecordingMotorController()
+
+    def _rng(self, name):
+        """A random.Random for one simulated component, seeded from the scenario's seed."""
+        return random.Random(f"{self.seed}/{name}")
+
+    def _create_ultrasonic_sensor(self):
+        return UltrasonicSensor(SimulatedUltrasonicDriver(rng=self._rng("ultrasonic")),
+                                on_proximity=self.motor_controller.stop)
+
+    def _create_imu_sensor(self):
+        return IMUSensor(SimulatedIMUDriver(rng=self._rng("imu")))
+
+    def _create_lidar(self):
+        return SimulatedLidar(rng=self._rng("lidar"))
+
+    def _create_object_detector(self):
+        if not self.scenario.get("video"):
+            return _NoVideoDetector()
+        if self.lockstep:
+            return ObjectDetectorProcess(video_source=self.scenario["video"], realtime=False,
+                                         show_window=False, frame_limit=self.frame_limit,
+                                         frames_done=self.frames_done)
+        return ObjectDetectorProcess(video_source=self.scenario["video"],
+                                     realtime=self.realtime, show_window=False)
+
+    def _create_wake_word_detector(self):
+        if not self._pending_interactions:
+            self._current_interaction = None
+            self._idle_since = time.monotonic()
+            return _IdleWakeWordDetector()
+        interaction = self._current_interaction = self._pending_interactions.pop(0)
+        due_time, due_frame = self._due_time(interaction), self._due_frame(interaction)
+
+        def is_due():
+            if self.realtime:
+                return time.monotonic() - self._started_at >= due_time
+            return self.frames_done.value >= due_frame or self._video_ended_at is not None
+
+        return WavWakeWordDetector(self.wake_word_event, interaction["wake"],
+                                   is_due=is_due, realtime=self.realtime)
+
+    # --- Scenario timeline ---
+
+    def _due_time(self, interaction):
+        """An interaction's position on the timeline, in seconds of video time."""
+        if "at_frame" in interaction and self.video_fps:
+            return interaction["at_frame"] / self.video_fps
+        return interaction.get("at", 0.0)
+
+    def _due_frame(self, interaction):
+        """An interaction's position on the timeline, as a number of frames analysed."""
+        if "at_frame" in interaction:
+            return interaction["at_frame"]
+        return round(interaction.get("at", 0.0) * (self.video_fps or 0.0))
+
+    def _scenario_time(self):
+        """
+        Seconds into the scenario. In lockstep this is the video time of the
+        frames analysed so far, continuing on the wall clock once the video
+        has ended (for the tail).
+        """
+        now = time.monotonic()
+        if not self.lockstep:
+            return now - self._started_at
+        video_time = self.frames_done.value / self.video_fps
+        if self._video_ended_at is not None:
+            return video_time + now - self._video_ended_at
+        return video_time
+
+    def _clock(self):
+        return self._scenario_time()
+
+    def _release_next_frame(self):
+        """Lets the vision process read one more frame, unless an interaction is due first."""
+        done = self.frames_done.value
+        interaction = self._current_interaction
+        if interaction is not None and done >= self._due_frame(interaction):
+            return  # held here until the interaction's command has been handled
+        self.frame_limit.value = done + 1
+
+    # --- Measurement hooks ---
+
+    def _listen_to_current_interaction(self, recognizer):
+        interaction = self._current_interaction
+        if self.wake_word_detector.missed:
+            self.mismatches.append(f"wake word not detected in '{interaction['wake']}'")
+            return None
+        self._wake_detected_at = self.wake_word_detector.detected_at
+        command = recognizer.listen_to_wav(interaction["command"], realtime=self.realtime)
+        self._speech_ended_at = recognizer.last_audio_ended_at
+        self.commands.append(command)
+
+        expected = interaction.get("expect_command")
+        if expected is not None and command != expected:
+            self.mismatches.append(f"heard {command!r}, expected {expected!r}")
+        return command
+
+    def process_command(self, command):
+        super().process_command(command)
+        handled_at = time.monotonic()
+        if self._speech_ended_at is not None:
+            latency = handled_at - self._speech_ended_at
+            if latency < 0:
+                self.mismatches.append(f"negative command latency ({latency * 1000.0:.1f} ms)")
+            else:
+                self.command_latencies.append(latency)
+            self._speech_ended_at = None
+        if self._wake_detected_at is not None:
+            self.wake_to_command_latencies.append(handled_at - self._wake_detected_at)
+            self._wake_detected_at = None
+
+    def check_obstacle_state(self):
+        if self._video_ended_at is None and not self.vision_process.is_alive():
+            self._video_ended_at = time.monotonic()
+        stepping = self.lockstep and self._video_ended_at is None
+        # In lockstep the state is only checked between frames, never while
+        # the vision process is half-way through one.
+        if not stepping or self.frames_done.value >= self.frame_limit.value:
+            was_stopped = self.is_stopped_by_vision
+            super().check_obstacle_state()
+
+            if self.is_stopped_by_vision and not was_stopped and self.obstacle_seen_by_vision:
+                stopped_at = self.motor_controller.actions[-1][1]
+                self.stop_latencies.append(stopped_at - self.vision_obstacle_timestamp.value)
+            if stepping:
+                self._release_next_frame()
+
+        now = time.monotonic()
+        timed_out = now - self._started_at >= self.scenario.get("timeout", 120.0)
+        finished = (self._idle_since is not None and self._video_ended_at is not None
+                    and now - self._idle_since >= self.scenario.get("tail", 3.0))
+        if finished or timed_out:
+            if timed_out and not finished:
+                self.mismatches.append("scenario timed out")
+            self.shutdown_requested.set()
+
+    def cleanup(self):
+        self.motor_controller.recording = False
+        super().cleanup()
+
+    # --- Running and reporting ---
+
+    def run(self):
+        """Runs the scenario to completion and returns its report."""
+        self._started_at = time.monotonic()
+        super().run()
+        return self.report()
+
+    def report(self):
+        actions = [action for action, _ in self.motor_controller.actions]
+        expected_actions = self.scenario.get("expect_actions")
+        if expected_actions is not None and not _is_subsequence(expected_actions, actions):
+            self.mismatches.append(f"actions {actions} do not contain {expected_actions} in order")
+
+        def relative(t):
+            return round(t - self._started_at, 4)
+
+        return {
+            'scenario': self.scenario["name"],
+            'seed': self.seed,
+            'realtime': self.realtime,
+            'duration_s': round(time.monotonic() - self._started_at, 3),
+            'command_latencies_ms': [round(s * 1000.0, 2) for s in self.command_latencies],
+            'wake_to_command_latencies_ms': [round(s * 1000.0, 2)
+                                             for s in self.wake_to_command_latencies],
+            'stop_latencies_ms': [round(s * 1000.0, 2) for s in self.stop_latencies],
+            'commands': self.commands,
+            'actions': [(action, relative(t)) for action, t in self.motor_controller.actions],
+            'spoken': [(text, relative(t)) for text, t in self.audio_process.spoken],
+            'mismatches': self.mismatches,
+        }
+
+
+def _is_subsequence(expected, actual):
+    remaining = iter(actual)
+    return all(item in remaining for item in expected)
@@ -0,0 +1,87 @@
+# sensors/imu.py
+
+import random
+
+from .sampler import RingBuffer, SensorSampler
+
+# MPU-6050 on the Raspberry Pi's I2C bus 1.
+I2C_BUS = 1
+MPU6050_ADDRESS = 0x68
+PWR_MGMT_1 = 0x6B
+ACCEL_XOUT_H = 0x3B
+ACCEL_SCALE = 16384.0       # LSB per g at the default +/-2 g range
+GYRO_SCALE = 131.0          # LSB per deg/s at the default +/-250 deg/s range
+
+SAMPLE_RATE_HZ = 100
+
+
+class SimulatedIMUDriver:
+    """
+    Simulates an MPU-6050 lying flat and still, with a little sensor noise.
+    Pass a seeded random.Random as rng for repeatable readings.
+    """
+    def __init__(self, noise=0.01, rng=None):
+        self.noise = noise
+        self.rng = rng or random
+        self.accel = [0.0, 0.0, 1.0]
+        self.gyro = [0.0, 0.0, 0.0]
+
+    def read(self):
+        return [v + self.rng.gauss(0.0, self.noise) for v in self.accel + self.gyro]
+
+
+class MPU6050Driver:
+    """
+    Reads acceleration (g) and angular rate (deg/s) from an MPU-6050 over I2C.
+    """
+    def __init__(self, bus, address=MPU6050_ADDRESS):
+        self.bus = bus
+        self.address = address
+        self.bus.write_byte_data(self.address, PWR_MGMT_1, 0)  # wake the chip up
+
+    def read(self):
+        """Returns [ax, ay, az, gx, gy, gz]."""
+        data = self.bus.read_i2c_block_data(self.address, ACCEL_XOUT_H, 14)
+        words = []
+        for i in range(0, 14, 2):
+            word = (data[i] << 8) | data[i + 1]
+            words.append(word - 65536 if word > 32767 else word)
+        ax, ay, az, _temperature, gx, gy, gz = words
+        return [ax / ACCEL_SCALE, ay / ACCEL_SCALE, az / ACCEL_SCALE,
+                gx / GYRO_SCALE, gy / GYRO_SCALE, gz / GYRO_SCALE]
+
+    def close(self):
+        self.bus.close()
+
+
+def create_imu_driver():
+    """Returns the real MPU-6050 driver on a Raspberry Pi, or a simulated one elsewhere."""
+    try:
+        from smbus2 import SMBus
+        driver = MPU6050Driver(SMBus(I2C_BUS))
+        print("IMU: Running on Raspberry Pi with a real MPU-6050.")
+        return driver
+    except (ImportError, OSError):
+        print("IMU: Running in simulation mode.")
+        return SimulatedIMUDriver()
+
+
+class IMUSensor(SensorSampler):
+    """
+    Samples the IMU at a fixed rate, smooths it with an EMA and pushes
+    [ax, ay, az, gx, gy, gz] rows into a ring buffer.
+    """
+    def __init__(self, driver=None, rate_hz=SAMPLE_RATE_HZ, ema_alpha=0.3, buffer_size=512):
+        super().__init__(driver or create_imu_driver(), rate_hz, name="IMUSensor")
+        self.ema_alpha = ema_alpha
+        self.buffer = RingBuffer(buffer_size, width=6)
+        self._filtered = None
+
+    def process(self, timestamp, raw):
+        if raw is None:
+            return
+        if self._filtered is None:
+            self._filtered = list(raw)
+        else:
+            self._filtered = [f + self.ema_alpha * (r - f) for f, r in zip(self._filtered, raw)]
+        self.buffer.push(timestamp, self._filtered)
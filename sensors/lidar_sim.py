@@ -0,0 +1,49 @@
+# sensors/lidar_sim.py
+
+import math
+import random
+
+NUM_BEAMS = 360
+MAX_RANGE = 8.0     # metres
+
+
+class SimulatedLidar:
+    """
+    Simulates a 360-degree LiDAR standing in a rectangular room.
+
+    Until a real LiDAR is fitted, this provides the scans used for room
+    learning and "where am I" place recognition. Pass a seeded random.Random
+    as rng for repeatable scans.
+    """
+    def __init__(self, width=4.0, height=3.0, x=None, y=None, heading=0.0,
+                 num_beams=NUM_BEAMS, noise=0.01, rng=None):
+        self.width = width
+        self.height = height
+        self.x = width / 2 if x is None else x
+        self.y = height / 2 if y is None else y
+        self.heading = heading
+        self.num_beams = num_beams
+        self.noise = noise
+        self.rng = rng or random
+
+    def read_scan(self):
+        """
+        Returns one scan: a list of num_beams ranges in metres, starting at the
+        robot's heading and going counter-clockwise.
+        """
+        scan = []
+        for i in range(self.num_beams):
+            angle = math.radians(self.heading) + 2 * math.pi * i / self.num_beams
+            dx, dy = math.cos(angle), math.sin(angle)
+            hits = []
+            if dx > 0:
+                hits.append((self.width - self.x) / dx)
+            elif dx < 0:
+                hits.append(-self.x / dx)
+            if dy > 0:
+                hits.append((self.height - self.y) / dy)
+            elif dy < 0:
+                hits.append(-self.y / dy)
+            distance = min(hits) + self.rng.gauss(0.0, self.noise)
+            scan.append(min(max(distance, 0.0), MAX_RANGE))
+        return scan
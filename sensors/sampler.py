@@ -0,0 +1,114 @@
+# sensors/sampler.py
+
+"""
+Shared building blocks for the fixed-rate sensor threads in sensors/.
+
+RingBuffer holds the most recent timestamped readings of one sensor in
+preallocated NumPy arrays, and SensorSampler is a thread that reads a
+driver at a fixed rate and pushes each reading into such a buffer.
+"""
+
+import time
+from threading import Thread, Event
+
+import numpy as np
+
+from telemetry import metrics
+
+
+class RingBuffer:
+    """
+    A fixed-size, single-producer ring buffer of timestamped readings.
+
+    Only the sampling thread writes. It fills a slot first and publishes it
+    by bumping the write counter afterwards, so readers on other threads
+    never need a lock. A reader only sees a torn row if the writer laps
+    the whole buffer while it is copying.
+    """
+    def __init__(self, capacity, width=1):
+        self.capacity = capacity
+        self.width = width
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros((capacity, width), dtype=np.float32)
+        self._count = 0
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def push(self, timestamp, values):
+        """Appends one reading. Must only be called from the producer thread."""
+        slot = self._count % self.capacity
+        self.timestamps[slot] = timestamp
+        self.values[slot] = values
+        self._count += 1
+
+    def latest(self):
+        """
+        Returns the newest reading.
+
+        Returns:
+            tuple: (timestamp, values), or None if the buffer is empty.
+        """
+        count = self._count
+        if count == 0:
+            return None
+        slot = (count - 1) % self.capacity
+        return self.timestamps[slot], self.values[slot].copy()
+
+    def snapshot(self, n=None):
+        """
+        Returns copies of the newest n readings, oldest first.
+
+        Returns:
+            tuple: (timestamps, values) as NumPy arrays.
+        """
+        count = self._count
+        n = min(count, self.capacity) if n is None else min(n, count, self.capacity)
+        indices = np.arange(count - n, count) % self.capacity
+        return self.timestamps[indices], self.values[indices]
+
+
+class SensorSampler(Thread):
+    """
+    A daemon thread that samples a sensor at a fixed rate.
+
+    Ticks are scheduled against absolute time.monotonic() deadlines so the
+    rate does not drift with the cost of each read. If a read overruns,
+    the missed ticks are skipped (and counted) instead of bursting to catch up.
+    Subclasses implement process(timestamp, raw) to filter and store a reading.
+    """
+    def __init__(self, driver, rate_hz, name=None):
+        super().__init__(name=name, daemon=True)
+        self.driver = driver
+        self.period = 1.0 / rate_hz
+        self.overruns = 0
+        self._stop_event = Event()
+
+    def process(self, timestamp, raw):
+        raise NotImplementedError
+
+    def run(self):
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                raw = self.driver.read()
+                self.process(time.monotonic(), raw)
+            except Exception as e:
+                print(f"Error in {self.name} sampling loop: {e}")
+
+            next_tick += self.period
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            else:
+                missed = int(-delay // self.period) + 1
+                self.overruns += missed
+                metrics.incr(f"{self.name}.overruns", missed)
+                next_tick += missed * self.period
+
+        if hasattr(self.driver, 'close'):
+            self.driver.close()
+
+    def stop(self):
+        """Signals the sampling loop to stop from outside."""
+        self._stop_event.set()
@@ -0,0 +1,169 @@
+# sensors/ultrasonic.py
+
+import time
+import random
+from collections import deque
+from threading import Event
+
+import numpy as np
+
+from telemetry import metrics
+from .sampler import RingBuffer, SensorSampler
+
+# HC-SR04 wiring (BCM numbering); pins 17/27/22/23/24/25 are used by the motors.
+TRIG_PIN = 5
+ECHO_PIN = 6
+SPEED_OF_SOUND = 343.0      # metres per second
+# Metres. The HC-SR04 reaches ~4 m, but this sensor only guards against close
+# obstacles (vision covers the rest), and a shorter echo wait lets it ping at 100 Hz.
+MAX_RANGE = 1.5
+
+SAMPLE_RATE_HZ = 100
+STOP_DISTANCE = 0.35        # metres; closer than this stops the motors immediately
+CLEAR_DISTANCE = 0.50       # metres; hysteresis before the obstacle counts as gone
+
+
+class SimulatedUltrasonicDriver:
+    """
+    Simulates an HC-SR04 so the sampling pipeline can run without hardware.
+    Tests and demos move the simulated obstacle with set_distance(), and can
+    pass a seeded random.Random as rng for repeatable readings.
+    """
+    def __init__(self, distance=MAX_RANGE, noise=0.01, dropout_rate=0.0, rng=None):
+        self.rng = rng or random
+        self.distance = distance
+        self.noise = noise
+        self.dropout_rate = dropout_rate
+
+    def set_distance(self, distance):
+        self.distance = distance
+
+    def read(self):
+        if self.rng.random() < self.dropout_rate:
+            return None
+        return max(0.0, self.distance + self.rng.gauss(0.0, self.noise))
+
+
+class HCSR04Driver:
+    """
+    Reads distance from an HC-SR04 ultrasonic sensor through RPi.GPIO.
+    """
+    def __init__(self, GPIO, trig_pin=TRIG_PIN, echo_pin=ECHO_PIN):
+        self.GPIO = GPIO
+        self.trig_pin = trig_pin
+        self.echo_pin = echo_pin
+        self.echo_timeout = 2 * MAX_RANGE / SPEED_OF_SOUND
+
+        self.GPIO.setmode(self.GPIO.BCM)
+        self.GPIO.setup(self.trig_pin, self.GPIO.OUT)
+        self.GPIO.setup(self.echo_pin, self.GPIO.IN)
+        self.GPIO.output(self.trig_pin, self.GPIO.LOW)
+
+    def read(self):
+        """
+        Returns the measured distance in metres: MAX_RANGE if nothing is within
+        range, or None if the echo pulse never started (a sensor fault).
+        """
+        self.GPIO.output(self.trig_pin, self.GPIO.HIGH)
+        time.sleep(10e-6)
+        self.GPIO.output(self.trig_pin, self.GPIO.LOW)
+
+        deadline = time.perf_counter() + self.echo_timeout
+        pulse_start = time.perf_counter()
+        while self.GPIO.input(self.echo_pin) == 0:
+            pulse_start = time.perf_counter()
+            if pulse_start > deadline:
+                return None
+        pulse_end = pulse_start
+        while self.GPIO.input(self.echo_pin) == 1:
+            pulse_end = time.perf_counter()
+            if pulse_end > pulse_start + self.echo_timeout:
+                return MAX_RANGE
+        return (pulse_end - pulse_start) * SPEED_OF_SOUND / 2
+
+
+def create_ultrasonic_driver():
+    """Returns the real HC-SR04 driver on a Raspberry Pi, or a simulated one elsewhere."""
+    try:
+        import RPi.GPIO as GPIO
+        print("Ultrasonic: Running on Raspberry Pi with real RPi.GPIO.")
+        return HCSR04Driver(GPIO)
+    except (ImportError, RuntimeError):
+        print("Ultrasonic: Running in simulation mode.")
+        return SimulatedUltrasonicDriver()
+
+
+class UltrasonicSensor(SensorSampler):
+    """
+    Samples the ultrasonic sensor at a fixed rate and filters the readings.
+
+    Each raw reading goes through a short median filter (to reject echo
+    glitches) and an EMA, and (raw, median, filtered) rows are pushed into a
+    ring buffer.
+
+    The stop trigger works on the raw reading so it does not wait for the
+    filters to catch up. A raw reading below stop_distance is confirmed by
+    confirm_readings immediate extra pings (at that range the echo returns in
+    about 2 ms) rather than by waiting for the next ticks; if they agree,
+    on_proximity is called straight from the sampling thread.
+    last_trigger_latency runs from the first sample that saw the obstacle.
+    The obstacle is considered gone once the median rises above clear_distance.
+    """
+    def __init__(self, driver=None, on_proximity=None, rate_hz=SAMPLE_RATE_HZ,
+                 stop_distance=STOP_DISTANCE, clear_distance=CLEAR_DISTANCE,
+                 confirm_readings=1, median_window=3, ema_alpha=0.5, buffer_size=256):
+        super().__init__(driver or create_ultrasonic_driver(), rate_hz, name="UltrasonicSensor")
+        self.on_proximity = on_proximity
+        self.stop_distance = stop_distance
+        self.clear_distance = clear_distance
+        self.confirm_readings = confirm_readings
+        self.ema_alpha = ema_alpha
+        self.buffer = RingBuffer(buffer_size, width=3)
+        self.obstacle_detected = Event()
+        self.last_trigger_latency = None
+        self._close_since = None
+        self._window = deque(maxlen=median_window)
+        self._filtered = None
+
+    @property
+    def distance(self):
+        """The latest filtered distance in metres, or None before the first reading."""
+        return self._filtered
+
+    def process(self, timestamp, raw):
+        if raw is None:
+            return
+        raw = min(raw, MAX_RANGE)
+        self._window.append(raw)
+        median = float(np.median(self._window))
+        if self._filtered is None:
+            self._filtered = median
+        else:
+            self._filtered += self.ema_alpha * (median - self._filtered)
+        self.buffer.push(timestamp, (raw, median, self._filtered))
+
+        if self.obstacle_detected.is_set():
+            if median > self.clear_distance:
+                self.obstacle_detected.clear()
+            return
+
+        if raw >= self.stop_distance:
+            self._close_since = None
+            return
+        if self._close_since is None:
+            self._close_since = timestamp
+        if self._confirmed():
+            self.obstacle_detected.set()
+            if self.on_proximity:
+                self.on_proximity()
+            self.last_trigger_latency = time.monotonic() - self._close_since
+            metrics.observe("ultrasonic.obstacle_to_stop", self.last_trigger_latency)
+            self._close_since = None
+
+    def _confirmed(self):
+        """Pings again right away; True if every extra reading is also too close."""
+        for _ in range(self.confirm_readings):
+            reading = self.driver.read()
+            if reading is None or reading >= self.stop_distance:
+                return False
+        return True
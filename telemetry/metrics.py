@@ -0,0 +1,221 @@
+# telemetry/metrics.py
+
+"""
+Lightweight latency tracing and counters for the Robot's processes.
+
+Every process (main, vision, audio) calls configure() once and then records
+into its own module-level registry:
+- observe()/observe_since(): per-stage latency histograms,
+- incr(): monotonically increasing counters (e.g. dropped frames),
+- gauge(): last-value readings (e.g. queue depths, TTS backlog).
+
+Timestamps come from time.monotonic(), which reads the same system-wide
+clock in every process, so a timestamp taken in the vision process can be
+subtracted from one taken in the main process.
+
+Each process periodically writes a JSON snapshot to
+<METRICS_DIR>/<process>.json; serve_http() exposes the merged snapshots on
+a local HTTP endpoint. When metrics are disabled every recording call
+returns immediately.
+"""
+
+import bisect
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+try:
+    from config import METRICS_ENABLED, METRICS_DIR, METRICS_EXPORT_INTERVAL
+except ImportError:
+    METRICS_ENABLED = False
+    METRICS_DIR = "metrics_output"
+    METRICS_EXPORT_INTERVAL = 5.0
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended.
+BUCKET_BOUNDS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+now = time.monotonic
+
+_enabled = False
+_process_name = "main"
+_output_dir = METRICS_DIR
+_export_interval = METRICS_EXPORT_INTERVAL
+_last_export = 0.0
+_histograms = {}
+_counters = {}
+_gauges = {}
+
+
+class LatencyHistogram:
+    """A fixed-bucket latency histogram with count, sum, min and max."""
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float('inf')
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p):
+        """Returns the upper bound of the bucket holding the p-th percentile."""
+        if self.count == 0:
+            return None
+        rank = p / 100.0 * self.count
+        seen = 0
+        for bound, n in zip(BUCKET_BOUNDS_MS + [self.max_ms], self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else None,
+            'min_ms': self.min_ms if self.count else None,
+            'max_ms': self.max_ms if self.count else None,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'bucket_bounds_ms': BUCKET_BOUNDS_MS,
+            'buckets': self.buckets,
+        }
+
+
+def configure(process_name, enabled=None, output_dir=None, export_interval=None):
+    """
+    Sets up metrics for the calling process. Call once at process start-up;
+    child processes must call it themselves since nothing is inherited on spawn.
+    """
+    global _enabled, _process_name, _output_dir, _export_interval, _last_export
+    _process_name = process_name
+    _enabled = METRICS_ENABLED if enabled is None else enabled
+    _output_dir = output_dir or METRICS_DIR
+    _export_interval = METRICS_EXPORT_INTERVAL if export_interval is None else export_interval
+    _last_export = now()
+    _histograms.clear()
+    _counters.clear()
+    _gauges.clear()
+
+
+def is_enabled():
+    return _enabled
+
+
+def observe(stage, seconds):
+    """Records a latency (in seconds) for a stage."""
+    if not _enabled:
+        return
+    histogram = _histograms.get(stage)
+    if histogram is None:
+        histogram = _histograms[stage] = LatencyHistogram()
+    histogram.add(seconds * 1000.0)
+
+
+def observe_since(stage, start):
+    """Records the time elapsed since a now() timestamp, which may come from another process."""
+    if not _enabled or not start:
+        return
+    observe(stage, now() - start)
+
+
+def incr(counter, n=1):
+    if not _enabled:
+        return
+    _counters[counter] = _counters.get(counter, 0) + n
+
+
+def gauge(name, value):
+    if not _enabled:
+        return
+    _gauges[name] = value
+
+
+def snapshot():
+    """Returns this process's metrics as a JSON-serialisable dict."""
+    return {
+        'process': _process_name,
+        'pid': os.getpid(),
+        'monotonic': now(),
+        'counters': dict(_counters),
+        'gauges': dict(_gauges),
+        # Copy first: the sensor threads may add a new stage while this runs.
+        'histograms': {stage: h.to_dict() for stage, h in dict(_histograms).items()},
+    }
+
+
+def export():
+    """Writes this process's snapshot to <output_dir>/<process>.json."""
+    global _last_export
+    if not _enabled:
+        return
+    _last_export = now()
+    try:
+        os.makedirs(_output_dir, exist_ok=True)
+        path = os.path.join(_output_dir, f"{_process_name}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(snapshot(), f, indent=2)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"⚠️ [Metrics] Could not export metrics: {e}")
+
+
+def maybe_export():
+    """Exports if the export interval has elapsed. Cheap enough to call every loop."""
+    if _enabled and now() - _last_export >= _export_interval:
+        export()
+
+
+def load_all(output_dir=None):
+    """Reads every process's exported snapshot from output_dir."""
+    output_dir = output_dir or _output_dir
+    snapshots = {}
+    try:
+        names = sorted(os.listdir(output_dir))
+    except FileNotFoundError:
+        return snapshots
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(output_dir, name), "r") as f:
+                snapshots[name[:-len(".json")]] = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+    return snapshots
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps(load_all(), indent=2).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_http(port):
+    """
+    Serves the merged snapshots of all processes as JSON on 127.0.0.1:port.
+
+    Returns:
+        ThreadingHTTPServer: The running server (call shutdown() to stop it), or None if disabled.
+    """
+    if not _enabled:
+        return None
+    server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsRequestHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    print(f"📈 [Metrics] Serving metrics on http://127.0.0.1:{port}/")
+    return server
@@ -0,0 +1,37 @@
+# tests/test_geocoding.py
+
+import os
+
+from navigation.geocoding import Gazetteer, haversine_m, is_relative_place, normalize_place_name
+
+
+def _empty_gazetteer():
+    return Gazetteer(path=os.devnull)
+
+
+def test_nearest_searches_past_the_first_ring_with_a_hit():
+    # A is found first (cell (3, 3)), but B in cell (5, 0) is closer.
+    origin = (0.005, 0.005)
+    place_a = (0.0399, 0.0399)
+    place_b = (0.0501, 0.005)
+    gazetteer = _empty_gazetteer()
+    gazetteer.add("Pharmacy A", "pharmacy", *place_a)
+    gazetteer.add("Pharmacy B", "pharmacy", *place_b)
+
+    assert haversine_m(origin, place_b) < haversine_m(origin, place_a)
+    assert gazetteer.nearest("pharmacy", origin) == place_b
+
+
+def test_nearest_returns_none_for_unknown_category():
+    gazetteer = _empty_gazetteer()
+    gazetteer.add("Pharmacy A", "pharmacy", 9.689, 76.495)
+
+    assert gazetteer.nearest("supermarket", (9.684, 76.488)) is None
+    assert gazetteer.nearest("nearest pharmacy", (9.684, 76.488)) == (9.689, 76.495)
+
+
+def test_is_relative_place_flags_position_dependent_queries():
+    assert is_relative_place("Nearest pharmacy")
+    assert is_relative_place("the closest supermarket")
+    assert not is_relative_place("Ettumanoor Mahadeva Temple")
+    assert normalize_place_name("nearest pharmacy") == normalize_place_name("pharmacy")
@@ -0,0 +1,89 @@
+# tests/test_sensors.py
+
+import time
+
+import numpy as np
+
+from sensors.sampler import RingBuffer
+from sensors.ultrasonic import UltrasonicSensor, SimulatedUltrasonicDriver, MAX_RANGE
+
+
+def test_ring_buffer_wraps_around_and_keeps_the_newest_readings():
+    buffer = RingBuffer(4, width=2)
+    assert buffer.latest() is None
+    assert len(buffer.snapshot()[0]) == 0
+
+    for i in range(6):
+        buffer.push(float(i), (i, 10 * i))
+
+    assert len(buffer) == 4
+    timestamp, values = buffer.latest()
+    assert timestamp == 5.0
+    assert values.tolist() == [5, 50]
+
+    timestamps, values = buffer.snapshot()
+    assert timestamps.tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert values[:, 0].tolist() == [2, 3, 4, 5]
+    timestamps, _ = buffer.snapshot(2)
+    assert timestamps.tolist() == [4.0, 5.0]
+
+
+def test_ring_buffer_copies_are_not_overwritten_by_later_pushes():
+    buffer = RingBuffer(2)
+    buffer.push(0.0, 1.0)
+    _, latest = buffer.latest()
+    _, snapshot = buffer.snapshot()
+    buffer.push(1.0, 2.0)
+    buffer.push(2.0, 3.0)
+
+    assert latest.tolist() == [1.0]
+    assert snapshot.tolist() == [[1.0]]
+
+
+def test_step_to_close_obstacle_calls_on_proximity_quickly():
+    driver = SimulatedUltrasonicDriver(distance=MAX_RANGE, noise=0.0)
+    stops = []
+    sensor = UltrasonicSensor(driver, on_proximity=lambda: stops.append(time.monotonic()))
+    sensor.start()
+    try:
+        time.sleep(0.05)
+        assert not stops
+        driver.set_distance(0.2)
+        assert sensor.obstacle_detected.wait(1.0)
+    finally:
+        sensor.stop()
+        sensor.join(timeout=1)
+
+    assert len(stops) == 1
+    # One 100 Hz tick plus the confirming ping, with room for a busy machine.
+    assert 0.0 <= sensor.last_trigger_latency < 0.1
+
+
+def test_obstacle_clears_only_past_clear_distance():
+    driver = SimulatedUltrasonicDriver(distance=0.2, noise=0.0)
+    stops = []
+    sensor = UltrasonicSensor(driver, on_proximity=lambda: stops.append(True))
+    t = 0.0
+
+    def feed(distance, n):
+        nonlocal t
+        driver.set_distance(distance)
+        for _ in range(n):
+            t += sensor.period
+            sensor.process(t, distance)
+
+    feed(0.2, 1)
+    assert sensor.obstacle_detected.is_set()
+
+    # Between stop_distance and clear_distance: still an obstacle, no new stop.
+    feed(0.45, 5)
+    assert sensor.obstacle_detected.is_set()
+    feed(0.2, 5)
+    assert len(stops) == 1
+
+    feed(0.8, 5)
+    assert not sensor.obstacle_detected.is_set()
+    assert np.isclose(sensor.buffer.latest()[1][0], 0.8)
+
+    feed(0.2, 1)
+    assert len(stops) == 2
@@ -4,6 +4,7 @@ import cv2
 import time
 from ultralytics import YOLO
 from .object_mapper import map_object_to_alert
+from telemetry import metrics
 
 # ❌ We have REMOVED pyttsx3 and the speak_async function from this file.
 
@@ -11,10 +12,26 @@ class ObjectDetectorProcess:
     """
     A class that encapsulates the object detection logic.
     Its ONLY job is to continuously update a shared flag.
+
+    If video_source is a file path, frames come from that recording instead
+    of a webcam. With realtime=True the recording is paced at its own frame
+    rate, and frames that fall due while the model is busy are skipped,
+    just like a live camera would drop them.
+
+    frame_limit and frames_done (shared multiprocessing.Value('i') counters)
+    let replay/harness.py step a recording in lockstep: frame n is only read
+    once frame_limit.value > n, and frames_done.value is bumped after each
+    frame has updated the shared flag. Use them with realtime=False.
     """
-    def __init__(self, model_name="yolov8n.pt"):
+    def __init__(self, model_name="yolov8n.pt", video_source=None, realtime=True, show_window=True,
+                 frame_limit=None, frames_done=None):
         print("🧠 [VISION] Initializing Object Detector...")
         self.model = self._load_yolo_model(model_name)
+        self.video_source = video_source
+        self.realtime = realtime
+        self.show_window = show_window
+        self.frame_limit = frame_limit
+        self.frames_done = frames_done
         self.cap = None
 
     def _load_yolo_model(self, model_name):
@@ -27,6 +44,13 @@ class ObjectDetectorProcess:
             return None
 
     def _init_camera(self):
+        if self.video_source is not None:
+            cap = cv2.VideoCapture(self.video_source)
+            if cap.isOpened():
+                print(f"🧠 [VISION] Replaying video '{self.video_source}'.")
+                return cap
+            print(f"Error: Could not open video '{self.video_source}'.")
+            return None
         for camera_index in range(3):
             cap = cv2.VideoCapture(camera_index)
             time.sleep(1)
@@ -37,24 +61,55 @@ class ObjectDetectorProcess:
         print("Error: Could not open any webcam.")
         return None
 
-    def run(self, shared_obstacle_flag, stop_event):
+    def run(self, shared_obstacle_flag, stop_event, shared_obstacle_timestamp=None):
         """
         The main loop for the vision process.
-        It continuously updates the shared boolean flag.
+        It continuously updates the shared boolean flag. When the flag goes up,
+        shared_obstacle_timestamp (if given) receives the time.monotonic() at
+        which the triggering frame was captured, for latency tracing.
         """
+        metrics.configure("vision")
         self.cap = self._init_camera()
         if not self.cap or not self.model:
             shared_obstacle_flag.value = False
             return
 
         critical_objects = {'Human', 'Chair', 'Door', 'Obstacle'}
+        camera_fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        last_frame_at = None
+        playback_started_at = metrics.now()
 
         while not stop_event.is_set():
+            if self.video_source is not None and self.realtime:
+                due = int((metrics.now() - playback_started_at) * camera_fps)
+                position = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+                if position > due:
+                    stop_event.wait((position - due) / camera_fps)
+                for _ in range(due - position):
+                    self.cap.grab()
+            if self.frame_limit is not None:
+                while self.frames_done.value >= self.frame_limit.value and not stop_event.is_set():
+                    stop_event.wait(0.001)
+                if stop_event.is_set():
+                    break
+
             ret, frame = self.cap.read()
             if not ret:
+                metrics.incr("vision.read_failures")
                 break
 
+            frame_at = metrics.now()
+            if metrics.is_enabled():
+                metrics.incr("vision.frames")
+                if last_frame_at is not None:
+                    interval = frame_at - last_frame_at
+                    metrics.observe("vision.frame_interval", interval)
+                    # Frames the camera produced while we were busy are dropped by its buffer.
+                    metrics.incr("vision.dropped_frames", max(0, round(interval * camera_fps) - 1))
+                last_frame_at = frame_at
+
             results = self.model(frame, verbose=False)[0]
+            metrics.observe_since("vision.inference", frame_at)
 
             detected_alerts = set()
             for r in results.boxes:
@@ -67,12 +122,20 @@ class ObjectDetectorProcess:
 
             # CORE LOGIC: Update the shared flag based on current detections.
             if not critical_objects.isdisjoint(detected_alerts):
+                if shared_obstacle_timestamp is not None and not shared_obstacle_flag.value:
+                    shared_obstacle_timestamp.value = frame_at
                 shared_obstacle_flag.value = True
             else:
                 shared_obstacle_flag.value = False
+            metrics.observe_since("vision.frame_to_flag", frame_at)
+            if self.frames_done is not None:
+                self.frames_done.value += 1
 
             # --- Visual Display Logic (can be commented out for performance) ---
             # This part remains the same.
+            if not self.show_window:
+                metrics.maybe_export()
+                continue
             for r in results.boxes:
                 label = self.model.names[int(r.cls[0])]
                 confidence = r.conf[0]
@@ -85,9 +148,12 @@ class ObjectDetectorProcess:
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 stop_event.set()
             # --- End Visual Display Logic ---
+            metrics.maybe_export()
 
         shared_obstacle_flag.value = False
+        metrics.export()
         if self.cap:
             self.cap.release()
-        cv2.destroyAllWindows()
+        if self.show_window:
+            cv2.destroyAllWindows()
         print("🧠 [VISION] Vision process stopped.")
\ No newline at end of file
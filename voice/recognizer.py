@@ -3,6 +3,8 @@ import vosk
 import sounddevice as sd
 import json
 import sys
+import time
+import wave
 import numpy as np
 
 # Change the path to the Indian English model
@@ -23,6 +25,8 @@ class VoiceRecognizer:
         # Convert the list to a JSON grammar string
         grammar = json.dumps(VOSK_VOCABULARY)
         self.recognizer = vosk.KaldiRecognizer(self.model, self.samplerate, grammar)
+        # time.monotonic() at which the last WAV given to listen_to_wav() ended.
+        self.last_audio_ended_at = None
         
         # Find and print the default input device
         try:
@@ -55,4 +59,50 @@ class VoiceRecognizer:
                             return command
         except Exception as e:
             print(f"An error occurred in the audio stream: {e}", file=sys.stderr)
-            return None
\ No newline at end of file
+            return None
+
+    def listen_to_wav(self, wav_path, realtime=True):
+        """
+        Recognises a command from a recorded WAV file instead of the microphone.
+
+        The file must be 16-bit mono at the recognizer's sample rate. With
+        realtime=True the audio is fed at the pace a live microphone would
+        deliver it, so timings match a live run. last_audio_ended_at is then
+        set to when the last sample fed to the recognizer would have been
+        spoken (recognition can finish before the end of the clip); without
+        realtime it is the moment feeding stopped.
+
+        Args:
+            wav_path (str): Path to the recording.
+            realtime (bool): Pace the audio in real time.
+
+        Returns:
+            str: The recognised command, or None if nothing was heard.
+        """
+        with wave.open(wav_path, "rb") as wav:
+            if (wav.getnchannels() != 1 or wav.getsampwidth() != 2
+                    or wav.getframerate() != self.samplerate):
+                raise ValueError(f"'{wav_path}' must be 16-bit mono at {self.samplerate} Hz.")
+
+            command = ""
+            started_at = time.monotonic()
+            fed_seconds = 0.0
+            while True:
+                audio_data_bytes = wav.readframes(8000)
+                if not audio_data_bytes:
+                    break
+                if realtime:
+                    fed_seconds += len(audio_data_bytes) / 2 / self.samplerate
+                    time.sleep(max(0.0, started_at + fed_seconds - time.monotonic()))
+                if self.recognizer.AcceptWaveform(audio_data_bytes):
+                    command = json.loads(self.recognizer.Result()).get('text', '')
+                    if command:
+                        break
+
+        self.last_audio_ended_at = started_at + fed_seconds if realtime else time.monotonic()
+        if not command:
+            command = json.loads(self.recognizer.FinalResult()).get('text', '')
+        self.recognizer.Reset()
+        if command:
+            print(f"Heard: {command}")
+        return command or None
\ No newline at end of file
@@ -7,6 +7,8 @@ from playsound import playsound
 import tempfile
 import os
 
+from telemetry import metrics
+
 class AudioProcess(multiprocessing.Process):
     """
     A dedicated, isolated process for handling all text-to-speech requests.
@@ -26,19 +28,30 @@ class AudioProcess(multiprocessing.Process):
     def run(self):
         """The main loop for the audio server process."""
         print("🎤 Legendary Audio Server Process started.")
+        metrics.configure("audio")
         while True:
             try:
                 # This call will block efficiently, waiting for a message.
-                text = self.audio_queue.get()
+                message = self.audio_queue.get()
 
                 # A 'None' message is our signal to shut down gracefully.
-                if text is None:
+                if message is None:
                     print("🎤 Audio Server received shutdown signal.")
                     break
 
+                # Messages are (text, time queued) tuples; plain strings are still accepted.
+                text, queued_at = message if isinstance(message, tuple) else (message, None)
+                metrics.observe_since("tts.queue_wait", queued_at)
+                if metrics.is_enabled():
+                    try:
+                        metrics.gauge("tts.backlog", self.audio_queue.qsize())
+                    except NotImplementedError:
+                        pass
+
                 print(f"AudioProcess speaking: '{text}'")
 
                 # 1. Generate the speech and save it to a temporary file
+                started_at = metrics.now()
                 tts = gTTS(text=text, lang='en', tld='co.in') # 'co.in' for Indian English accent
                 
                 # Using a temporary file is the most compatible way across OSes
@@ -46,12 +59,17 @@ class AudioProcess(multiprocessing.Process):
                     temp_filename = fp.name
                 
                 tts.save(temp_filename)
+                metrics.observe_since("tts.synthesis", started_at)
                 
                 # 2. Play the generated audio file
+                started_at = metrics.now()
                 playsound(temp_filename)
+                metrics.observe_since("tts.playback", started_at)
+                metrics.observe_since("tts.queued_to_spoken", queued_at)
                 
                 # 3. Clean up the temporary file
                 os.remove(temp_filename)
+                metrics.maybe_export()
 
 
             except queue.Empty:
@@ -60,4 +78,5 @@ class AudioProcess(multiprocessing.Process):
                 # Catch potential gTTS/playsound errors (e.g., no internet connection)
                 print(f"Error in AudioProcess: {e}")
 
+        metrics.export()
         print("🎤 Audio Server Process shutting down.")
\ No newline at end of file
@@ -30,6 +30,7 @@ class WakeWordDetector(Thread):
         self.porcupine = None
         self.recorder = None
         self.is_listening = True
+        self.detected_at = None  # time.monotonic() of the detection, for latency tracing
 
         try:
             if not NOVA_WAKE_WORD_MODEL_PATH:
@@ -61,6 +62,7 @@ class WakeWordDetector(Thread):
                 pcm = self.recorder.read()
                 result = self.porcupine.process(pcm)
                 if result >= 0:
+                    self.detected_at = time.monotonic()
                     print(f"🚨 Wake word 'NOVA' detected!")
                     self.wake_word_detected_event.set()
                     self.is_listening = False # Exit the loop